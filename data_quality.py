@@ -0,0 +1,177 @@
+import pandas as pd
+import numpy as np
+
+# Issues that make a row unusable; these rows are dropped when quarantining.
+# The remaining issues are reported as warnings only.
+HARD_ISSUES = ['Missing Entity', 'Duplicate Row', 'Unparseable Date', 'Unparseable Metric', 'Negative Metric']
+
+
+def _unparseable(raw, parsed):
+    # Value was present in the file but could not be converted.
+    # Only the (usually tiny) set of rows that failed to parse is inspected as text.
+    failed = parsed.isna() & raw.notna()
+    if failed.any():
+        failed[failed] = raw[failed].astype(str).str.strip() != ''
+    return failed
+
+
+def _parse_goal(raw):
+    # Goals repeat across every row of an entity, so only the distinct values are parsed
+    codes, uniques = pd.factorize(raw)
+    parsed = pd.to_numeric(pd.Series(uniques).astype(str).str.replace('%', '', regex=False), errors='coerce')
+    values = np.append(parsed.to_numpy(dtype=float), np.nan)[codes]  # code -1 (missing) -> NaN
+    return pd.Series(values, index=raw.index)
+
+
+# --- Shared Quality Gate ---
+def run_quality_checks(df, entity_col, metric_cols, start_col, end_col, goal_cols=(), date_col='Date', quarantine=False):
+    """
+    Flags data problems that the checks would otherwise silently absorb, in a few vectorized passes.
+
+    Issues detected per row:
+      - Missing Entity       : no entity name; the row cannot be attributed to any IO / LI
+      - Duplicate Row        : exact copy of an earlier row (every column equal, dated and with an entity);
+                               cumsum would double-count
+      - Conflicting Duplicate: several differing rows for the same (entity, date); the checks sum them,
+                               so they are kept and only reported
+      - Unparseable Date     : Date / flight dates that become NaT
+      - Unparseable Metric   : metric values that are not numeric
+      - Negative Metric      : metric values below zero
+      - Unparseable Goal     : goal values (e.g. '83%') that are not numeric once '%' is removed
+      - Date Gap             : previous calendar day missing for this entity; DoD would read it as 0 spend
+      - Flight Inconsistent  : start after end, date outside the flight, or flight dates changing within an entity
+
+    Args:
+        quarantine (bool): If True, rows with a HARD_ISSUES problem are removed from the returned frame
+                           (only the extra copies of an exact duplicate are removed, the first row is kept).
+
+    Returns:
+        tuple: (report, clean_df)
+            report   : one row per issue type found, with row count, entity count and example entities
+            clean_df : input frame (or the quarantined version of it), with original dtypes untouched
+    """
+    # 1. Parsing (one pass per column)
+    dates = pd.to_datetime(df[date_col], errors='coerce')
+    starts = pd.to_datetime(df[start_col], errors='coerce')
+    ends = pd.to_datetime(df[end_col], errors='coerce')
+
+    metrics = {col: pd.to_numeric(df[col], errors='coerce') for col in metric_cols if col in df.columns}
+    goals = {col: _parse_goal(df[col]) for col in goal_cols if col in df.columns}
+
+    # Integer entity codes so sorting / grouping never touches the (long) name strings (-1 = missing)
+    entity_codes = pd.factorize(df[entity_col])[0]
+    day_numbers = dates.to_numpy(dtype='datetime64[D]').astype('int64')
+    has_entity = entity_codes >= 0
+
+    issues = {}
+
+    # 2. Missing keys and duplicates
+    issues['Missing Entity'] = pd.Series(~has_entity, index=df.index)
+
+    # Only rows whose (entity, date) key repeats can be duplicates, so the full-row
+    # comparison runs on that (usually tiny) subset instead of hashing every row
+    keyed = np.flatnonzero(has_entity & dates.notna().to_numpy())
+    keys = pd.DataFrame({'e': entity_codes[keyed], 'd': day_numbers[keyed]})
+    colliding = keyed[keys.duplicated(keep=False).to_numpy()]
+
+    exact = np.zeros(len(df), dtype=bool)
+    exact[colliding] = df.iloc[colliding].duplicated(keep='first').to_numpy()
+    issues['Duplicate Row'] = pd.Series(exact, index=df.index)
+
+    # Same (entity, date) left after dropping exact copies -> the rows disagree
+    remaining = colliding[~exact[colliding]]
+    conflict = np.zeros(len(df), dtype=bool)
+    conflict[remaining] = pd.DataFrame(
+        {'e': entity_codes[remaining], 'd': day_numbers[remaining]}
+    ).duplicated(keep=False).to_numpy()
+    issues['Conflicting Duplicate'] = pd.Series(conflict, index=df.index)
+
+    # 3. Unparseable values
+    issues['Unparseable Date'] = (
+        _unparseable(df[date_col], dates) | dates.isna()
+        | _unparseable(df[start_col], starts) | _unparseable(df[end_col], ends)
+    )
+
+    issues['Unparseable Metric'] = pd.Series(False, index=df.index)
+    issues['Negative Metric'] = pd.Series(False, index=df.index)
+    for col, values in metrics.items():
+        issues['Unparseable Metric'] |= _unparseable(df[col], values)
+        issues['Negative Metric'] |= values < 0
+
+    issues['Unparseable Goal'] = pd.Series(False, index=df.index)
+    for col, values in goals.items():
+        issues['Unparseable Goal'] |= _unparseable(df[col], values)
+
+    # 4. Date gaps (sort once by entity, date)
+    valid_date = dates.notna().to_numpy() & has_entity
+    order = np.lexsort((day_numbers, entity_codes))
+    order = order[valid_date[order]]
+    sorted_entity = entity_codes[order]
+    sorted_days = day_numbers[order]
+    same_entity = np.r_[False, sorted_entity[1:] == sorted_entity[:-1]]
+    gap_sorted = same_entity & (np.r_[0, np.diff(sorted_days)] > 1)
+    gap = np.zeros(len(df), dtype=bool)
+    gap[order] = gap_sorted
+    issues['Date Gap'] = pd.Series(gap, index=df.index)
+
+    # 5. Flight consistency
+    by_entity = pd.DataFrame({'s': starts, 'e': ends}).groupby(entity_codes)
+    spread = by_entity.transform('max') != by_entity.transform('min')
+    flight_changes = spread['s'] | spread['e']
+    issues['Flight Inconsistent'] = (starts > ends) | (dates < starts) | (dates > ends) | flight_changes
+
+    # 6. Compact Report
+    flags = pd.DataFrame(issues).fillna(False).astype(bool)
+    rows = []
+    for issue in flags.columns:
+        mask = flags[issue].to_numpy()
+        if not mask.any():
+            continue
+        entities = df.loc[mask, entity_col].dropna().drop_duplicates()
+        rows.append({
+            'Issue': issue,
+            'Severity': 'Quarantine' if issue in HARD_ISSUES else 'Warning',
+            'Rows': int(mask.sum()),
+            'Entities': len(entities),
+            'Examples': ', '.join(entities.astype(str).head(3)),
+        })
+    report = pd.DataFrame(rows, columns=['Issue', 'Severity', 'Rows', 'Entities', 'Examples'])
+
+    if quarantine:
+        bad = flags[HARD_ISSUES].any(axis=1).to_numpy()
+        return report, df[~bad]
+
+    return report, df
+
+
+# --- 1. IO Level (Data.csv) ---
+def check_io_data_quality(df, quarantine=False):
+    """Runs the quality gate on IO level data (Data.csv)."""
+    return run_quality_checks(
+        df,
+        entity_col='Insertion_Order_Name',
+        metric_cols=['Spends', 'Impressions', 'Clicks', 'Complete_Views', 'Planned_Budget', 'Insertion_Order_Goal_Value(KPI)'],
+        start_col='IO_Start_Date',
+        end_col='IO_End_Date',
+        quarantine=quarantine,
+    )
+
+
+# --- 2. Line Item Level (LI_Data.csv) ---
+def check_li_data_quality(df, quarantine=False):
+    """Runs the quality gate on Line Item level data (LI_Data.csv), including the '83%' style LI_Goal."""
+    return run_quality_checks(
+        df,
+        entity_col='Line_Item_Name',
+        metric_cols=['LI_Spends', 'Impressions', 'Clicks', 'Complete_Views_(Video)', 'IO_Planned_Budget', 'Insertion_Order_Goal_Value'],
+        start_col='Line_Item_Start_Date',
+        end_col='Line_Item_End_Date',
+        goal_cols=['LI_Goal'],
+        quarantine=quarantine,
+    )
+
+# --- Example Usage ---
+
+# io_df = pd.read_csv('Data.csv')
+# report, io_df_clean = check_io_data_quality(io_df, quarantine=True)
+# print(report.to_string(index=False))
@@ -1,7 +1,21 @@
+from html import escape
+
 import pandas as pd
 
-def generate_email_body(df):
-    alert_columns = ['Spend Alert', 'Impression Alert', 'KPI Alert', 'Placement Alert', 'Deal Health']
+# The scorecard contract: one row per entity, grouped by IO_ID, one text column per check
+ALERT_COLUMNS = ['Spend Alert', 'Impression Alert', 'KPI Alert', 'Placement Alert', 'Deal Health']
+
+def generate_email_body(df, max_ios=None, max_rows_per_io=None, has_attachments=False):
+    """
+    Renders the scorecard as HTML, one table per IO with every non-OK alert.
+    If max_ios is set, only the IOs with the most alerts are rendered and the rest
+    are summarised in a footer (the full detail travels as attachments).
+    If max_rows_per_io is set, each IO table stops after that many alert rows
+    and ends with a count of the rows left out.
+    has_attachments only controls whether the footer points readers to the attached files.
+    Entity names and alert text (which can carry publisher app names / URLs) are HTML-escaped.
+    """
+    alert_columns = ALERT_COLUMNS
     
     # Filter: Keep only rows where at least one alert is NOT 'OK'
     # This removes completely healthy Line Items from the dataset entirely
@@ -11,6 +25,15 @@ def generate_email_body(df):
     if df_errors.empty:
         return None  # No email needed
 
+    # Bound the email: keep the IOs with the most alerts
+    omitted = 0
+    if max_ios is not None:
+        alerts_per_io = df_errors[alert_columns].ne("OK").sum(axis=1).groupby(df_errors['IO_ID']).sum()
+        if len(alerts_per_io) > max_ios:
+            keep = alerts_per_io.nlargest(max_ios).index
+            omitted = len(alerts_per_io) - max_ios
+            df_errors = df_errors[df_errors['IO_ID'].isin(keep)]
+
     # Start HTML
     html_content = "<h2>🚨 Daily IO Scorecards</h2>"
     
@@ -21,29 +44,52 @@ def generate_email_body(df):
         io_table = f"""
         <div style="margin-bottom: 25px; border: 1px solid #ccc; border-radius: 5px; overflow: hidden;">
             <div style="background-color: #eee; padding: 10px; font-weight: bold; border-bottom: 1px solid #ccc;">
-                IO ID: {io_id}
+                IO ID: {escape(str(io_id))}
             </div>
             <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
                 <tr style="background-color: #f9f9f9; text-align: left;">
+                    <th style="padding: 8px; border-bottom: 1px solid #ddd;">Entity</th>
+                    <th style="padding: 8px; border-bottom: 1px solid #ddd;">Level</th>
                     <th style="padding: 8px; border-bottom: 1px solid #ddd;">Alert Type</th>
                     <th style="padding: 8px; border-bottom: 1px solid #ddd; color: #d9534f;">Issue Detected</th>
                 </tr>
         """
         
         # Loop through each Line Item in this IO
+        rows_shown = 0
+        rows_hidden = 0
         for _, row in group.iterrows():
             # Check each of the 5 alert types
             for col in alert_columns:
                 if row[col] != "OK":
+                    if max_rows_per_io is not None and rows_shown >= max_rows_per_io:
+                        rows_hidden += 1
+                        continue
+                    rows_shown += 1
                     # Add a row for this specific error
                     io_table += f"""
                     <tr>
+                        <td style="padding: 8px; border-bottom: 1px solid #eee;">{escape(str(row.get('Entity', io_id)))}</td>
+                        <td style="padding: 8px; border-bottom: 1px solid #eee;">{escape(str(row.get('Level', '')))}</td>
                         <td style="padding: 8px; border-bottom: 1px solid #eee;">{col}</td>
-                        <td style="padding: 8px; border-bottom: 1px solid #eee; color: #d9534f; font-weight: bold;">{row[col]}</td>
+                        <td style="padding: 8px; border-bottom: 1px solid #eee; color: #d9534f; font-weight: bold;">{escape(str(row[col]))}</td>
                     </tr>
                     """
         
+        if rows_hidden:
+            io_table += f"""
+                    <tr>
+                        <td colspan="4" style="padding: 8px; font-style: italic;">{rows_hidden} more alerts for this IO are not shown.</td>
+                    </tr>
+                    """
+
         io_table += "</table></div>"
         html_content += io_table
 
+    if omitted:
+        footer = f"{omitted} more IOs with alerts are not shown."
+        if has_attachments:
+            footer += " See the attached files for the full results."
+        html_content += f"<p>{footer}</p>"
+
     return html_content
\ No newline at end of file
@@ -0,0 +1,99 @@
+import os
+import time
+
+import pandas as pd
+
+# Frames from run_checks that are worth attaching in full
+DEFAULT_EXPORTS = ['pacing_io', 'pacing_li', 'forecast_io', 'forecast_li', 'kpi_io', 'pg_lag_io', 'pg_lag_li']
+
+EXPORT_SUFFIXES = ('.csv.gz', '.parquet')
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def prune_exports(out_dir='exports', max_age_days=14):
+    """
+    Deletes export files older than max_age_days so a resident scheduler does not grow
+    out_dir forever. Only files with an export suffix are touched.
+
+    Returns:
+        list of str: Paths of the files removed.
+    """
+    if not os.path.isdir(out_dir):
+        return []
+
+    cutoff = time.time() - max_age_days * 86400
+    removed = []
+    for entry in os.scandir(out_dir):
+        if entry.is_file() and entry.name.endswith(EXPORT_SUFFIXES) and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed.append(entry.path)
+    return removed
+
+
+def export_frames(frames, target_date_str, out_dir='exports', fmt='csv', names=None, chunksize=100_000,
+                  max_age_days=14):
+    """
+    Writes the full processed frames to compressed files for attaching to the alert email.
+
+    CSV is written as gzip straight from the frame in chunks (no intermediate CSV string
+    held in memory). Parquet uses snappy compression and needs pyarrow; without it we fall
+    back to gzip CSV.
+
+    Files are named after the target date (e.g. pacing_io_2025-04-02.csv.gz), so re-running a
+    date replaces its own files and a backfill never overwrites another day's.
+
+    Args:
+        frames (dict): name -> DataFrame (e.g. the output of main.run_checks).
+        target_date_str (str): The date the frames were computed for (anything pd.to_datetime parses).
+        out_dir (str): Directory for the files (created if missing).
+        fmt (str): 'csv' (gzip-compressed CSV) or 'parquet'.
+        names (list): Which frames to export. Defaults to DEFAULT_EXPORTS.
+        max_age_days (int): Older exports in out_dir are pruned first (None keeps everything).
+
+    Returns:
+        list of str: Paths of the files written (empty/missing frames are skipped).
+    """
+    if fmt == 'parquet' and not _parquet_available():
+        print("pyarrow not installed, exporting gzip CSV instead of Parquet")
+        fmt = 'csv'
+
+    if max_age_days is not None:
+        prune_exports(out_dir, max_age_days)
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Same parsing the checks use, so any date they accept names the files
+    date_tag = pd.to_datetime(target_date_str).strftime('%Y-%m-%d')
+
+    paths = []
+    for name in names or DEFAULT_EXPORTS:
+        df = frames.get(name)
+        # kpi_alert returns a message string when there is no data for the date
+        if df is None or isinstance(df, str) or df.empty:
+            continue
+
+        if fmt == 'parquet':
+            path = os.path.join(out_dir, f"{name}_{date_tag}.parquet")
+            df.to_parquet(path, compression='snappy', index=False)
+        else:
+            path = os.path.join(out_dir, f"{name}_{date_tag}.csv.gz")
+            df.to_csv(path, index=False, compression='gzip', chunksize=chunksize)
+
+        paths.append(path)
+
+    return paths
+
+# --- Example Usage ---
+
+# results = run_checks('4/2/2025', IO_df, LI_df)
+# attachments = export_frames(results, '4/2/2025', out_dir='exports', fmt='csv')
+# send_alert(generate_email_body(scorecard, max_ios=20), subtype="html", attachments=attachments)
+
+# Clear out everything older than a week:
+# prune_exports('exports', max_age_days=7)
@@ -0,0 +1,211 @@
+import pandas as pd
+import numpy as np
+
+
+# --- Shared Forecast Engine ---
+def _forecast_delivery(df, target_date_str, entity_col, spend_col, budget_col, goal_col,
+                       start_col, end_col, lookback_days, seasonality, delivery_threshold, parent_col=None):
+    """
+    Projects end-of-flight Spend and Impressions for every entity in one batch.
+    History is laid out as a dense (entity x day) matrix so run-rates, weekday
+    factors and projections are computed with array ops instead of per-entity loops.
+    If parent_col is given, budget_col is the parent's budget and is shared across
+    its entities by their share of the parent's flight-to-date spend.
+    """
+    df = df.copy()
+
+    # 1. Date Parsing & Filtering
+    target_date = pd.to_datetime(target_date_str)
+    for col in ['Date', start_col, end_col]:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+
+    for col in [spend_col, 'Impressions', budget_col, goal_col]:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    # Only in-flight history up to the target date counts towards delivery.
+    # Rows without an entity name cannot be placed in the matrix and are dropped.
+    history_df = df[(df['Date'] <= target_date) & (df['Date'] >= df[start_col]) & df[entity_col].notna()]
+
+    if history_df.empty:
+        return pd.DataFrame()
+
+    # 2. Entity Static Details (latest settings per entity, same as pg_lag_alert)
+    meta = history_df.sort_values('Date').groupby(entity_col).tail(1)
+    meta_cols = [entity_col, budget_col, goal_col, start_col, end_col] + ([parent_col] if parent_col else [])
+    meta = meta[meta_cols].reset_index(drop=True)
+
+    # 3. Build Dense (entity x day) Matrices
+    # Duplicate (entity, date) rows are summed by np.add.at, matching groupby().sum()
+    entity_codes = pd.Index(meta[entity_col]).get_indexer(history_df[entity_col])
+    first_date = history_df['Date'].min()
+    n_days = (target_date - first_date).days + 1
+    day_idx = (history_df['Date'] - first_date).dt.days.to_numpy()
+
+    shape = (len(meta), n_days)
+    spend = np.zeros(shape)
+    imps = np.zeros(shape)
+    np.add.at(spend, (entity_codes, day_idx), history_df[spend_col].to_numpy(dtype=float))
+    np.add.at(imps, (entity_codes, day_idx), history_df['Impressions'].to_numpy(dtype=float))
+
+    # A day is "live" for an entity if it falls inside its flight window
+    start = meta[start_col].to_numpy(dtype='datetime64[D]')
+    end = meta[end_col].to_numpy(dtype='datetime64[D]')
+    days = np.datetime64(first_date.date(), 'D') + np.arange(n_days)
+    live = (days[None, :] >= start[:, None]) & (days[None, :] <= end[:, None])
+
+    # 4. Day-of-Week Factors
+    # factor[e, k] = mean daily spend on weekday k / mean daily spend, per entity
+    weekday = (days.astype('datetime64[D]').view('int64') - 4) % 7  # 1970-01-01 was a Thursday
+    weekday_onehot = np.eye(7)[weekday]
+
+    if seasonality:
+        def dow_factors(values):
+            dow_sum = (values * live) @ weekday_onehot
+            dow_count = live.astype(float) @ weekday_onehot
+            dow_mean = np.divide(dow_sum, dow_count, out=np.zeros_like(dow_sum), where=dow_count > 0)
+            overall = np.divide(dow_sum.sum(axis=1), dow_count.sum(axis=1),
+                                out=np.zeros(len(meta)), where=dow_count.sum(axis=1) > 0)
+            factors = np.divide(dow_mean, overall[:, None],
+                                out=np.ones_like(dow_mean), where=overall[:, None] > 0)
+            # Weekdays never observed get a neutral factor
+            return np.where(dow_count > 0, factors, 1.0)
+
+        spend_factors = dow_factors(spend)
+        imps_factors = dow_factors(imps)
+    else:
+        spend_factors = imps_factors = np.ones((len(meta), 7))
+
+    # 5. Recent Run-Rate (de-seasonalised over the lookback window)
+    window = live & (np.arange(n_days) >= n_days - lookback_days)[None, :]
+
+    def run_rate(values, factors):
+        window_sum = (values * window).sum(axis=1)
+        window_weight = (factors[:, weekday] * window).sum(axis=1)
+        return np.divide(window_sum, window_weight, out=np.zeros(len(meta)), where=window_weight > 0)
+
+    spend_rate = run_rate(spend, spend_factors)
+    imps_rate = run_rate(imps, imps_factors)
+
+    # 6. Remaining Flight Days, split by weekday
+    # count[e, k] = number of days with weekday k in (target_date, end_date]
+    remaining = np.clip((end - np.datetime64(target_date.date(), 'D')).astype(int), 0, None)
+    first_weekday = (target_date.dayofweek + 1) % 7
+    offsets = (np.arange(7) - first_weekday) % 7
+    remaining_by_dow = remaining[:, None] // 7 + (offsets[None, :] < (remaining % 7)[:, None])
+
+    # 7. Project End-of-Flight Totals
+    ftd_spend = spend.sum(axis=1)
+    ftd_imps = imps.sum(axis=1)
+    projected_spend = ftd_spend + spend_rate * (spend_factors * remaining_by_dow).sum(axis=1)
+    projected_imps = ftd_imps + imps_rate * (imps_factors * remaining_by_dow).sum(axis=1)
+
+    # Impression goal derived as (Budget / CPM) * 1000, as in pg_lag_alert
+    budget = meta[budget_col].to_numpy(dtype=float)
+    if parent_col:
+        # Share of the parent's FTD spend (equal split while the parent has spent nothing)
+        parent = meta[parent_col]
+        parent_spend = pd.Series(ftd_spend).groupby(parent.to_numpy()).transform('sum').to_numpy()
+        siblings = parent.map(parent.value_counts()).to_numpy(dtype=float)
+        share = np.where(parent_spend > 0, ftd_spend / np.where(parent_spend > 0, parent_spend, 1), 1 / siblings)
+        budget = budget * share
+    goal_cpm = meta[goal_col].to_numpy(dtype=float)
+    imps_goal = np.divide(budget, goal_cpm, out=np.zeros_like(budget), where=goal_cpm > 0) * 1000
+
+    result = meta[[entity_col]].copy()
+    result['Budget'] = budget
+    result['Days_Remaining'] = remaining
+    result['FTD_Spend'] = ftd_spend
+    result['Projected_Spend'] = projected_spend
+    result['FTD_Impressions'] = ftd_imps
+    result['Projected_Impressions'] = projected_imps
+
+    # Projected Delivery % = (Projected - Goal) / Goal
+    result['Projected_Spend_Delivery_%'] = np.where(
+        budget > 0, ((projected_spend - budget) / np.where(budget > 0, budget, 1)) * 100, 0.0
+    )
+    result['Projected_Impression_Delivery_%'] = np.where(
+        imps_goal > 0, ((projected_imps - imps_goal) / np.where(imps_goal > 0, imps_goal, 1)) * 100, 0.0
+    )
+
+    # Catch-up Rate = what must be delivered per remaining day to land on goal
+    result['Required_Daily_Spend'] = np.where(
+        remaining > 0, np.clip(budget - ftd_spend, 0, None) / np.maximum(remaining, 1), 0.0
+    )
+    result['Required_Daily_Impressions'] = np.where(
+        remaining > 0, np.clip(imps_goal - ftd_imps, 0, None) / np.maximum(remaining, 1), 0.0
+    )
+
+    # Formatting
+    cols = ['Budget', 'FTD_Spend', 'Projected_Spend', 'FTD_Impressions', 'Projected_Impressions', 'Projected_Spend_Delivery_%',
+            'Projected_Impression_Delivery_%', 'Required_Daily_Spend', 'Required_Daily_Impressions']
+    result[cols] = result[cols].round(1)
+
+    # 8. Generate Alert (with the projection and catch-up rate, so the email is actionable on its own)
+    spend_dev = result['Projected_Spend_Delivery_%']
+    detail = (
+        " (projected spend " + spend_dev.map('{:+.1f}%'.format)
+        + " vs budget, impressions " + result['Projected_Impression_Delivery_%'].map('{:+.1f}%'.format)
+        + " vs goal; needs " + result['Required_Daily_Spend'].map('{:,.1f}'.format)
+        + " spend/day to land on budget)"
+    )
+    result['Forecast_Alert'] = np.select(
+        [spend_dev < -delivery_threshold, spend_dev > delivery_threshold],
+        ["Forecast Alert: Under-delivery" + detail, "Forecast Alert: Over-delivery" + detail],
+        default="OK"
+    )
+
+    return result
+
+
+# --- 1. IO Level Forecast ---
+def forecast_io_delivery(df, target_date_str, lookback_days=7, seasonality=False, delivery_threshold=10.0):
+    """
+    Projects end-of-flight Spend and Impressions for every IO on a specific date.
+    Uses the recent run-rate (last `lookback_days`), optionally adjusted for day-of-week seasonality.
+    Alerts if projected spend lands outside +/- `delivery_threshold` % of Planned Budget.
+    """
+    return _forecast_delivery(
+        df, target_date_str,
+        entity_col='Insertion_Order_Name',
+        spend_col='Spends',
+        budget_col='Planned_Budget',
+        goal_col='Insertion_Order_Goal_Value(KPI)',
+        start_col='IO_Start_Date',
+        end_col='IO_End_Date',
+        lookback_days=lookback_days,
+        seasonality=seasonality,
+        delivery_threshold=delivery_threshold,
+    )
+
+
+# --- 2. LI Level Forecast ---
+def forecast_li_delivery(df, target_date_str, lookback_days=7, seasonality=False, delivery_threshold=10.0):
+    """
+    Projects end-of-flight Spend and Impressions for every Line Item on a specific date.
+    Each LI's goal is its share of IO Planned Budget, split by the LI's share of
+    the IO's flight-to-date spend (the whole IO budget would flag every LI).
+    """
+    return _forecast_delivery(
+        df, target_date_str,
+        entity_col='Line_Item_Name',
+        spend_col='LI_Spends',
+        budget_col='IO_Planned_Budget',
+        goal_col='Insertion_Order_Goal_Value',
+        start_col='Line_Item_Start_Date',
+        end_col='Line_Item_End_Date',
+        lookback_days=lookback_days,
+        seasonality=seasonality,
+        delivery_threshold=delivery_threshold,
+        parent_col='Insertion_Order',
+    )
+
+# --- Example Usage ---
+
+# io_df = pd.read_csv('Data.csv')
+# li_df = pd.read_csv('LI_Data.csv')
+
+# io_forecast = forecast_io_delivery(io_df, '4/15/2025', seasonality=True)
+# print(io_forecast.to_string())
+
+# li_forecast = forecast_li_delivery(li_df, '4/15/2025')
+# print(li_forecast.to_string())
@@ -1,17 +1,25 @@
 import os
 import json
 from datetime import datetime
-from google import genai
-from google.genai import types
 
-# Initialize the client globally or inside functions
+# google.genai is imported lazily: it is slow to import and only needed at the
+# very end of a run. The client is cached so a long-running scheduler reuses it.
+_client = None
+
 # The new SDK doesn't use a global 'configure' state like the old one
 def get_gemini_client():
-    """Initialize Gemini Client with API key from environment"""
+    """Initialize Gemini Client with API key from environment (cached after first call)"""
+    global _client
+    if _client is not None:
+        return _client
+
     api_key = os.getenv('GEMINI_API_KEY')
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables")
-    return genai.Client(api_key=api_key)
+
+    from google import genai
+    _client = genai.Client(api_key=api_key)
+    return _client
 
 
 def send_prompt_and_store(prompt_parts: list | str, output_file: str = None):
@@ -26,6 +34,7 @@ def send_prompt_and_store(prompt_parts: list | str, output_file: str = None):
         The response object or error dict
     """
     try:
+        from google.genai import types
         client = get_gemini_client()
         
         # Send prompt and get response using the new V1 SDK syntax
@@ -1,6 +1,16 @@
 import pandas as pd
 import numpy as np
 
+
+def _clean_goal(col):
+    """Parses goal columns like '83%' or '1.5' into floats (unparseable -> 0)."""
+    # Goals repeat across every row of a Line Item, so only the distinct values are parsed
+    codes, uniques = pd.factorize(col)
+    parsed = pd.to_numeric(pd.Series(uniques).astype(str).str.replace('%', '', regex=False), errors='coerce')
+    values = np.append(parsed.to_numpy(dtype=float), np.nan)[codes]  # code -1 (missing) -> NaN
+    return pd.Series(values, index=col.index).fillna(0)
+
+
 def calculate_li_daily_metrics(df, target_date_str):
     """
     Calculates CPM, CTR, and VTR percentages for Line Items for a specific date.
@@ -72,11 +82,8 @@ def calculate_li_daily_metrics(df, target_date_str):
     # 5. Deviation Calculations (vs Goals)
     
     # Clean Goal Columns (Remove '%' and convert to float)
-    def clean_goal(col):
-        return pd.to_numeric(col.astype(str).str.replace('%', '', regex=False), errors='coerce').fillna(0)
-
-    agg_df['Goal_CPM_Clean'] = clean_goal(agg_df['LI_CPM_Goal'])
-    agg_df['Goal_CTR_Clean'] = clean_goal(agg_df['LI_CTR_Goal'])
+    agg_df['Goal_CPM_Clean'] = _clean_goal(agg_df['LI_CPM_Goal'])
+    agg_df['Goal_CTR_Clean'] = _clean_goal(agg_df['LI_CTR_Goal'])
 
     # CPM Deviation %
     agg_df['CPM_Deviation%'] = np.where(
@@ -97,11 +104,116 @@ def calculate_li_daily_metrics(df, target_date_str):
     agg_df[cols_to_round] = agg_df[cols_to_round].round(2)
 
     # Select final columns for output
-    final_cols = ['LI_CPM_Goal', 'Achieved_CPM', 'CPM_Deviation%', 'LI_CTR_Goal','Achieved_CTR%', 'CTR_Deviation%']
+    final_cols = ['Line_Item', 'LI_CPM_Goal', 'Achieved_CPM', 'CPM_Deviation%', 'LI_CTR_Goal','Achieved_CTR%', 'CTR_Deviation%']
     
     return agg_df[final_cols]
 
+def calculate_placement_offenders(df, target_date_str, placement_col='App_URL', top_k=3, min_contribution=1.0):
+    """
+    Finds the placements (App/URL) dragging each Line Item away from its CPM/CTR goals on a specific date.
+
+    Each placement gets its share of the LI deviation, in percentage points, so that
+    summed over an LI they equal CPM_Deviation% / CTR_Deviation% from calculate_li_daily_metrics:
+      CPM_Contribution% = (Revenue_p - Goal_CPM * Impressions_p / 1000) / (Goal_CPM * LI_Impressions / 1000) * 100
+      CTR_Contribution% = (Clicks_p - Goal_CTR% * Impressions_p / 100) / (Goal_CTR% * LI_Impressions / 100) * 100
+    Offender score = CPM_Contribution% - CTR_Contribution% (overspend and missing clicks both hurt).
+    Only the top_k worst placements per LI are kept: the candidates above min_contribution
+    are sorted once by (Line Item, -score) and the first top_k rows of each LI are taken.
+    """
+    target_date = pd.to_datetime(target_date_str)
+    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+    daily_df = df[df['Date'] == target_date].copy()
+
+    if daily_df.empty:
+        print(f"No data found for {target_date_str}")
+        return pd.DataFrame()
+
+    for col in ['Revenue', 'Impressions', 'Clicks']:
+        daily_df[col] = pd.to_numeric(daily_df[col], errors='coerce').fillna(0)
+
+    daily_df['Goal_CPM_Clean'] = _clean_goal(daily_df['LI_CPM_Goal'])
+    daily_df['Goal_CTR_Clean'] = _clean_goal(daily_df['LI_CTR_Goal'])
+
+    # 1. Placement Level Aggregation (collapses multiple rows per App/URL for the day)
+    placement_df = daily_df.groupby(['Line_Item', placement_col], sort=False).agg(
+        Revenue=('Revenue', 'sum'),
+        Impressions=('Impressions', 'sum'),
+        Clicks=('Clicks', 'sum'),
+        Goal_CPM_Clean=('Goal_CPM_Clean', 'first'),
+        Goal_CTR_Clean=('Goal_CTR_Clean', 'first'),
+    ).reset_index()
+
+    li_imps = placement_df.groupby('Line_Item', sort=False)['Impressions'].transform('sum')
+
+    # 2. Contribution to LI Goal Deviation
+    cpm_base = placement_df['Goal_CPM_Clean'] * li_imps / 1000
+    placement_df['CPM_Contribution%'] = np.where(
+        cpm_base > 0,
+        (placement_df['Revenue'] - placement_df['Goal_CPM_Clean'] * placement_df['Impressions'] / 1000)
+        / cpm_base.where(cpm_base > 0, 1) * 100,
+        0.0
+    )
+
+    ctr_base = placement_df['Goal_CTR_Clean'] * li_imps / 100
+    placement_df['CTR_Contribution%'] = np.where(
+        ctr_base > 0,
+        (placement_df['Clicks'] - placement_df['Goal_CTR_Clean'] * placement_df['Impressions'] / 100)
+        / ctr_base.where(ctr_base > 0, 1) * 100,
+        0.0
+    )
+
+    placement_df['Offender_Score'] = placement_df['CPM_Contribution%'] - placement_df['CTR_Contribution%']
+
+    # 3. Top-K Selection
+    # Drop placements that are not hurting the LI before selecting, so the sort runs on a small set
+    final_cols = ['Line_Item', placement_col, 'Revenue', 'Impressions', 'Clicks',
+                  'CPM_Contribution%', 'CTR_Contribution%', 'Offender_Score']
+
+    candidates = placement_df[placement_df['Offender_Score'] > min_contribution]
+    if candidates.empty:
+        return candidates[final_cols]
+
+    # LIs keep their order of first appearance; the stable sort keeps the earlier row on ties
+    li_codes = pd.factorize(candidates['Line_Item'], sort=False)[0]
+    order = np.lexsort((-candidates['Offender_Score'].to_numpy(), li_codes))
+    order = order[li_codes[order] >= 0]
+    sorted_codes = li_codes[order]
+
+    # Rank within each LI = position minus the position where that LI's run starts
+    positions = np.arange(len(order))
+    run_start = np.maximum.accumulate(np.where(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]], positions, 0))
+    top_df = candidates.iloc[order[positions - run_start < top_k]].copy()
+
+    cols_to_round = ['CPM_Contribution%', 'CTR_Contribution%', 'Offender_Score']
+    top_df[cols_to_round] = top_df[cols_to_round].round(2)
+
+    return top_df[final_cols].reset_index(drop=True)
+
+
+def build_placement_alerts(offenders_df, placement_col='App_URL'):
+    """
+    Collapses the top offending placements into one 'Placement Alert' string per Line Item.
+    Line Items without offenders are simply absent (treated as OK downstream).
+    """
+    if offenders_df.empty:
+        return pd.DataFrame(columns=['Line_Item', 'Placement Alert'])
+
+    labels = (
+        offenders_df[placement_col].astype(str)
+        + " (CPM " + offenders_df['CPM_Contribution%'].map('{:+.1f}'.format)
+        + "pp, CTR " + offenders_df['CTR_Contribution%'].map('{:+.1f}'.format) + "pp)"
+    )
+
+    alerts = labels.groupby(offenders_df['Line_Item'], sort=False).agg(', '.join)
+    alerts = "Top offending placements: " + alerts
+
+    return alerts.rename('Placement Alert').reset_index()
+
 ## --- Example Usage ---
 # df = pd.read_csv('Placement_Data.csv')
 # results = calculate_li_daily_metrics(df, target_date_str='2025/03/25')
-# print(results.to_string())
\ No newline at end of file
+# print(results.to_string())
+
+# offenders = calculate_placement_offenders(df, target_date_str='2025/03/25', placement_col='App_URL', top_k=3)
+# print(build_placement_alerts(offenders).to_string())
\ No newline at end of file
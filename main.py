@@ -1,21 +1,18 @@
 import os
-import pandas as pd
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from dotenv import load_dotenv
-from email_body import generate_email_body
-from pacing import calculate_io_metrics, calculate_li_metrics
-from impression import get_daily_impression_deviation
-from kpi_alert import analyze_cpm_performance
-from goal_alert import calculate_li_daily_metrics
-from gemini_api import generate_prompt_from_dataframe, send_prompt_and_store
-
-load_dotenv()       
-
-SENDER = os.getenv('EMAIL_USER')
-PASSWORD = os.getenv('EMAIL_PASSWORD')
-RECEIVER = os.getenv('RECEIVER_EMAIL')
+
+# Heavy / optional dependencies (pandas, smtplib, dotenv, google.genai) are
+# imported inside the functions that need them so that importing this module,
+# or starting the scheduler in one-shot mode, stays cheap.
+
+
+def load_env():
+    """Loads .env into the environment if python-dotenv is available."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
 
 def filter_above_threshold(df, column_name, threshold):
     """
@@ -27,47 +24,190 @@ def filter_above_threshold(df, column_name, threshold):
     return filtered_df
 
 
-def send_alert():
-    if not SENDER or not PASSWORD:
+def email_configured():
+    """True when the sender credentials send_alert needs are set."""
+    return bool(os.getenv('EMAIL_USER') and os.getenv('EMAIL_PASSWORD'))
+
+
+def send_alert(body="testing", subtype="plain", attachments=None):
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.application import MIMEApplication
+
+    sender = os.getenv('EMAIL_USER')
+    password = os.getenv('EMAIL_PASSWORD')
+    receiver = os.getenv('RECEIVER_EMAIL')
+
+    if not email_configured():
         print("Error: Credentials missing! Check your .env file.")
         return
 
     message = MIMEMultipart()
-    message["From"] = SENDER
-    message["To"] = RECEIVER
+    message["From"] = sender
+    message["To"] = receiver
     message["Subject"] = "DV360 Alerts"
     
-    body = "testing"
-    message.attach(MIMEText(body, "plain"))
+    message.attach(MIMEText(body, subtype))
+
+    for path in attachments or []:
+        with open(path, 'rb') as f:
+            part = MIMEApplication(f.read(), Name=os.path.basename(path))
+        part['Content-Disposition'] = f'attachment; filename="{os.path.basename(path)}"'
+        message.attach(part)
 
     try:
         server = smtplib.SMTP("smtp.gmail.com", 587)
         server.starttls()
-        server.login(SENDER, PASSWORD)
-        server.sendmail(SENDER, RECEIVER, message.as_string())
+        server.login(sender, password)
+        server.sendmail(sender, receiver, message.as_string())
         print("Email sent successfully!")
         server.quit()
     except Exception as e:
         print(f"Error: {e}")
 
-# if __name__ == "__main__":
-#     send_alert()
 
-IO_df = pd.read_csv('Data.csv')
-LI_df = pd.read_csv('LI_Data.csv')
+def run_checks(target_date_str, IO_df, LI_df, impression_df=None, placement_df=None):
+    """
+    Runs every check for a specific date and returns the processed frames by name
+    (these are both the scorecard inputs and the full-detail attachments).
+    """
+    from pacing import calculate_io_metrics, calculate_li_metrics
+    from kpi_alert import analyze_cpm_performance
+    from pg_lag_alert import calculate_io_pg_lag, calculate_li_pg_lag
+    from forecast import forecast_io_delivery, forecast_li_delivery
+
+    results = {
+        'pacing_io': calculate_io_metrics(IO_df.copy(), target_date_str=target_date_str),
+        'pacing_li': calculate_li_metrics(LI_df.copy(), target_date_str=target_date_str),
+        'forecast_io': forecast_io_delivery(IO_df, target_date_str),
+        'forecast_li': forecast_li_delivery(LI_df, target_date_str),
+        'kpi_io': analyze_cpm_performance(IO_df.copy(), target_date_str),
+        'pg_lag_io': calculate_io_pg_lag(IO_df, target_date_str),
+        'pg_lag_li': calculate_li_pg_lag(LI_df, target_date_str),
+    }
+
+    if impression_df is not None:
+        from impression import check_daily_impression_deviation
+        results['impression'] = check_daily_impression_deviation(impression_df, target_date_str)
+
+    if placement_df is not None:
+        from goal_alert import calculate_li_daily_metrics, calculate_placement_offenders
+        results['goal_li'] = calculate_li_daily_metrics(placement_df.copy(), target_date_str)
+        results['placement_offenders'] = calculate_placement_offenders(placement_df.copy(), target_date_str)
+
+    return results
+
+
+def build_daily_scorecard(results, IO_df, LI_df):
+    """
+    Assembles the check outputs from run_checks into the scorecard
+    (one row per IO / LI with all alert columns) used for the email and the LLM prompt.
+    """
+    from scorecard import build_entity_index, status_alerts, threshold_alerts, message_alerts, assemble_scorecard
+
+    checks = {
+        'Spend Alert': [
+            threshold_alerts(results['pacing_io'], 'Insertion_Order_Name', 'Deviation %', 20, "FTD pacing deviation"),
+            threshold_alerts(results['pacing_io'], 'Insertion_Order_Name', 'DoD Deviation %', 25, "DoD spend change"),
+            threshold_alerts(results['pacing_li'], 'Line_Item_Name', 'DoD Deviation %', 25, "DoD spend change"),
+            status_alerts(results['forecast_io'], 'Insertion_Order_Name', 'Forecast_Alert'),
+            status_alerts(results['forecast_li'], 'Line_Item_Name', 'Forecast_Alert'),
+        ],
+        'KPI Alert': [
+            status_alerts(results['kpi_io'], 'Insertion_Order_Name', 'Status',
+                          "CPM DoD change over 20% and FTD CPM below goal"),
+        ],
+        # LI pg-lag measures each LI against the whole IO budget (see calculate_li_pg_lag),
+        # so it would flag nearly every LI; it stays in the attachments but not the scorecard
+        'Deal Health': [
+            status_alerts(results['pg_lag_io'], 'Insertion_Order_Name', 'Alert_Status'),
+        ],
+    }
+
+    if 'impression' in results:
+        checks['Impression Alert'] = [status_alerts(results['impression'], 'Insertion_Order', 'Status',
+                                                    "Daily impressions over 20% below goal")]
+
+    if 'goal_li' in results:
+        checks['KPI Alert'] += [
+            threshold_alerts(results['goal_li'], 'Line_Item', 'CPM_Deviation%', 20, "LI CPM vs goal"),
+            threshold_alerts(results['goal_li'], 'Line_Item', 'CTR_Deviation%', 20, "LI CTR vs goal"),
+        ]
+
+    if 'placement_offenders' in results:
+        from goal_alert import build_placement_alerts
+        placement_alerts = build_placement_alerts(results['placement_offenders'])
+        checks['Placement Alert'] = [message_alerts(placement_alerts, 'Line_Item', 'Placement Alert')]
+
+    return assemble_scorecard(build_entity_index(IO_df, LI_df), checks)
+
+
+def run_daily(target_date_str, IO_df=None, LI_df=None, impression_df=None, placement_df=None, quality_gate=True,
+              export_format='csv', max_ios=25, max_rows_per_io=20):
+    """
+    Runs the daily checks for a specific date, emails the scorecard and sends the anomalies to Gemini.
+    IO_df / LI_df can be passed in pre-loaded (e.g. kept warm by the scheduler);
+    they are copied before use because the checks parse columns in place.
+    With quality_gate, rows with no entity, exact duplicates and unparseable / negative rows are
+    quarantined before the checks run.
+    The email body is capped at max_ios IOs and max_rows_per_io alert rows per IO; the full
+    processed frames are attached as compressed files in export_format ('csv' for gzip CSV,
+    'parquet', or None to skip).
+    """
+    import pandas as pd
+    from email_body import generate_email_body
+    from scorecard import scorecard_alerts
+    from gemini_api import generate_prompt_from_dataframe, send_prompt_and_store
+
+    if IO_df is None:
+        IO_df = pd.read_csv('Data.csv')
+    if LI_df is None:
+        LI_df = pd.read_csv('LI_Data.csv')
+
+    if quality_gate:
+        from data_quality import check_io_data_quality, check_li_data_quality
+        io_report, IO_df = check_io_data_quality(IO_df, quarantine=True)
+        li_report, LI_df = check_li_data_quality(LI_df, quarantine=True)
+        for level, report in [('IO', io_report), ('LI', li_report)]:
+            if not report.empty:
+                print(f"Data quality issues ({level}):\n" + report.to_string(index=False))
+
+    results = run_checks(target_date_str, IO_df, LI_df, impression_df, placement_df)
+    scorecard = build_daily_scorecard(results, IO_df, LI_df)
+
+    alerts = scorecard_alerts(scorecard)
+    if alerts.empty:
+        print(f"No alerts for {target_date_str}")
+        return None
+
+    # Only write the attachments when there is an email to carry them
+    can_email = email_configured()
+    attachments = []
+    if can_email and export_format is not None:
+        from export import export_frames
+        attachments = export_frames(results, target_date_str, fmt=export_format)
 
-# io_df_processed = calculate_io_metrics(IO_df, target_date_str='4/2/2025')
-# pacing_ftd_IO =filter_above_threshold(io_df_processed, 'Deviation %', 20)[['Date', 'Insertion_Order_Name','Ideal Flight-to-Date Pacing', 'Actual Flight to Date Spend', 'Deviation %']]
-# pacing_DoD_IO = filter_above_threshold(io_df_processed, 'DoD Deviation %', 25)[['Date','Insertion_Order_Name', 'Today Spend', 'Yesterday Spend', 'DoD Deviation %']]
+    html = generate_email_body(scorecard, max_ios=max_ios, max_rows_per_io=max_rows_per_io,
+                               has_attachments=bool(attachments))
+    if can_email:
+        send_alert(html, subtype="html", attachments=attachments)
+    else:
+        print("Error: Credentials missing! Check your .env file. Skipping the email and its attachments.")
 
-# li_df_processed = calculate_li_metrics(LI_df, target_date_str='4/2/2025')
-# pacing_DoD_LI = filter_above_threshold(li_df_processed, 'DoD Deviation %', 25)[['Date','Insertion_Order', 'Today Spend', 'Yesterday Spend', 'DoD Deviation %']]
+    # # Creating one list from all dataframes:
+    df_list = []
+    df_list.append(f"### This is the DV360 scorecard for {target_date_str}, one row per IO / Line Item with every non-OK alert :\n" + alerts.to_csv(index=False))
 
-kpi_df = analyze_cpm_performance(IO_df, '4/2/2025')
+    prompt = generate_prompt_from_dataframe(df_list)
+    return send_prompt_and_store(prompt)
 
-# # Creating one list from all dataframes:
-df_list = []
-df_list.append("### This is the CPM Data for IO Level, reports alert where CPM DoD deviation is over 20 percent and FTD achieved CPM is less than target FTD CPM :\n" + kpi_df.to_csv(index=False))
 
-generate_prompt_from_dataframe(df_list)
-print(send_prompt_and_store(df_list))
\ No newline at end of file
+if __name__ == "__main__":
+    import pandas as pd
+    load_env()
+    optional = {
+        key: pd.read_csv(path) if os.path.exists(path) else None
+        for key, path in [('impression_df', 'Impression_Data.csv'), ('placement_df', 'Placement_Data.csv')]
+    }
+    print(run_daily('4/2/2025', **optional))
@@ -77,7 +77,7 @@ def calculate_io_pg_lag(df, target_date_str, lag_threshold=-20.0):
     cols = [ 'Derived_Impression_Goal', 'Ideal_FTD_Impressions', 'Actual_FTD_Impressions', 'Impression_Lag_%', 'Alert_Status']
     result[cols[1:5]] = result[cols[1:5]].round(1)
     
-    return result[cols]
+    return result[['Insertion_Order_Name'] + cols]
 
 
 # --- 2. LI Level PG Lag Check ---
@@ -146,21 +146,22 @@ def calculate_li_pg_lag(df, target_date_str, lag_threshold=-20.0):
     cols = [ 'Derived_Impression_Goal', 'Ideal_FTD_Impressions', 'Actual_FTD_Impressions', 'Impression_Lag_%', 'Alert_Status']
     result[cols[1:5]] = result[cols[1:5]].round(1)
     
-    return result[cols]
+    return result[['Line_Item_Name'] + cols]
 
 # --- Execution ---
 
-# Load Data
-io_df = pd.read_csv('Data.csv')
-li_df = pd.read_csv('LI_Data.csv')
+if __name__ == "__main__":
+    # Load Data
+    io_df = pd.read_csv('Data.csv')
+    li_df = pd.read_csv('LI_Data.csv')
 
-target_date = '4/1/2025'
+    target_date = '4/1/2025'
 
-print(f"\n--- IO Level PG Lag Check for {target_date} ---")
-io_check = calculate_io_pg_lag(io_df, target_date)
-# Using to_string() to ensure all columns are visible
-print(io_check.to_string())
+    print(f"\n--- IO Level PG Lag Check for {target_date} ---")
+    io_check = calculate_io_pg_lag(io_df, target_date)
+    # Using to_string() to ensure all columns are visible
+    print(io_check.to_string())
 
-print(f"\n--- LI Level PG Lag Check for {target_date} ---")
-li_check = calculate_li_pg_lag(li_df, target_date)
-print(li_check.to_string())
\ No newline at end of file
+    print(f"\n--- LI Level PG Lag Check for {target_date} ---")
+    li_check = calculate_li_pg_lag(li_df, target_date)
+    print(li_check.to_string())
\ No newline at end of file
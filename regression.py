@@ -0,0 +1,270 @@
+import os
+import sys
+import time
+import argparse
+import importlib
+
+import pandas as pd
+import numpy as np
+
+GOLDEN_DIR = 'golden'
+
+IO_DATES = ['4/1/2025', '4/2/2025', '4/15/2025', '4/30/2025']
+IMPRESSION_DATES = ['12/5/2025', '12/18/2025', '12/31/2025']
+MOCK_DATES = ['2023-10-24', '2023-10-25']
+
+
+# --- 1. Datasets ---
+def _goal_view_of_mock(df):
+    # daily_sales_mock.csv in the goal_alert (placement export) schema
+    return df.rename(columns={
+        'date': 'Date', 'LI_ID': 'Line_Item', 'spend': 'Revenue',
+        'impressions': 'Impressions', 'clicks': 'Clicks', 'io_goal_cpm': 'LI_CPM_Goal',
+    }).assign(LI_CTR_Goal=np.nan)
+
+
+def _placement_view_of_li(df):
+    # LI_Data.csv in the goal_alert schema: each IO plays the "Line Item" and its LIs the placements
+    return df.rename(columns={
+        'Insertion_Order': 'Line_Item', 'Line_Item_Name': 'App_URL', 'LI_Spends': 'Revenue',
+        'Insertion_Order_Goal_Value': 'LI_CPM_Goal', 'LI_Goal': 'LI_CTR_Goal',
+    })
+
+
+DATASETS = {
+    'io': ('Data.csv', None),
+    'li': ('LI_Data.csv', None),
+    'impression': ('Impression_Data.csv', None),
+    'mock_goal': ('daily_sales_mock.csv', _goal_view_of_mock),
+    'li_placement': ('LI_Data.csv', _placement_view_of_li),
+}
+
+_datasets = {}
+
+
+def load_dataset(key):
+    """Reads (and adapts) a dataset once; every case gets its own copy since the checks mutate inputs."""
+    if key not in _datasets:
+        path, adapter = DATASETS[key]
+        df = pd.read_csv(path)
+        _datasets[key] = adapter(df) if adapter else df
+    return _datasets[key].copy()
+
+
+# --- 2. Cases ---
+def _offender_alerts(df, date):
+    goal_alert = importlib.import_module('goal_alert')
+    return goal_alert.build_placement_alerts(goal_alert.calculate_placement_offenders(df, date))
+
+
+def build_cases():
+    """
+    Every (function, dataset, date) combination frozen in the golden set.
+    Each case is (name, 'module.function', dataset key, target date); functions
+    are resolved at run time so an engine can swap in alternates by the same name.
+    """
+    cases = []
+
+    def add(func, dataset, dates):
+        for date in dates:
+            name = f"{func.replace('.', '__')}__{dataset}__{date.replace('/', '-')}"
+            cases.append((name, func, dataset, date))
+
+    add('pacing.calculate_io_metrics', 'io', IO_DATES)
+    add('pacing.calculate_li_metrics', 'li', IO_DATES)
+    add('kpi_alert.analyze_cpm_performance', 'io', IO_DATES)
+    add('pg_lag_alert.calculate_io_pg_lag', 'io', IO_DATES)
+    add('pg_lag_alert.calculate_li_pg_lag', 'li', IO_DATES)
+    add('impression.check_daily_impression_deviation', 'impression', IMPRESSION_DATES)
+    add('goal_alert.calculate_li_daily_metrics', 'mock_goal', MOCK_DATES)
+    add('goal_alert.calculate_placement_offenders', 'li_placement', IO_DATES)
+    add('goal_alert.build_placement_alerts', 'li_placement', IO_DATES)
+    return cases
+
+
+DEFAULT_FUNCS = {
+    'goal_alert.build_placement_alerts': _offender_alerts,
+}
+
+
+def _resolve(func, engine):
+    if engine and func in engine:
+        return engine[func]
+    if func in DEFAULT_FUNCS:
+        return DEFAULT_FUNCS[func]
+    module_name, func_name = func.split('.')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _normalise(result):
+    # Put every output in a CSV round-trippable shape
+    if isinstance(result, str):
+        # kpi_alert returns a message when the date has no data
+        return pd.DataFrame({'Message': [result]})
+
+    df = result.reset_index(drop=True).copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = df[col].dt.strftime('%Y-%m-%d')
+    return df
+
+
+def compute_case(case, engine=None):
+    """Runs one case. `engine` maps 'module.function' -> alternate callable with the same signature."""
+    _, func, dataset, date = case
+    return _normalise(_resolve(func, engine)(load_dataset(dataset), date))
+
+
+# --- 3. Golden Files ---
+def _golden_path(name, golden_dir):
+    return os.path.join(golden_dir, f"{name}.csv")
+
+
+def _read_golden(path):
+    try:
+        return pd.read_csv(path)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def _round_trip(df):
+    # Same CSV round trip the golden files went through, so dtypes line up
+    from io import StringIO
+    buffer = StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return _read_golden(buffer)
+
+
+def freeze_golden(golden_dir=GOLDEN_DIR, engine=None):
+    """Writes the current outputs of every case as the new golden set."""
+    os.makedirs(golden_dir, exist_ok=True)
+    cases = build_cases()
+    for case in cases:
+        compute_case(case, engine).to_csv(_golden_path(case[0], golden_dir), index=False)
+    return len(cases)
+
+
+def diff_frames(expected, actual, rtol=1e-6, atol=1e-6, ignore_order=False):
+    """
+    Tolerance-aware frame comparison, whole columns at a time.
+    Numeric columns use np.isclose (NaN == NaN); everything else is compared as text.
+
+    Returns:
+        list of str: Human-readable differences (empty if the frames match).
+    """
+    problems = []
+
+    missing = [c for c in expected.columns if c not in actual.columns]
+    extra = [c for c in actual.columns if c not in expected.columns]
+    if missing:
+        problems.append(f"missing columns: {missing}")
+    if extra:
+        problems.append(f"unexpected columns: {extra}")
+    if len(expected) != len(actual):
+        problems.append(f"row count {len(actual)} != expected {len(expected)}")
+    if problems:
+        return problems
+
+    cols = list(expected.columns)
+    actual = actual[cols]
+
+    numeric = [c for c in cols if pd.api.types.is_numeric_dtype(expected[c])]
+    text = [c for c in cols if c not in numeric]
+
+    exp_text = expected[text].astype(object).where(expected[text].notna(), '').astype(str)
+    act_text = actual[text].astype(object).where(actual[text].notna(), '').astype(str)
+
+    if ignore_order and len(cols):
+        # Align rows on the text columns (keys), falling back to the numeric values
+        order_cols = text or numeric
+        exp_order = np.lexsort([exp_text[c] if c in text else expected[c] for c in reversed(order_cols)])
+        act_order = np.lexsort([act_text[c] if c in text else actual[c] for c in reversed(order_cols)])
+        expected, actual = expected.iloc[exp_order], actual.iloc[act_order]
+        exp_text, act_text = exp_text.iloc[exp_order], act_text.iloc[act_order]
+
+    if numeric:
+        exp_num = expected[numeric].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        act_num = actual[numeric].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        close = np.isclose(act_num, exp_num, rtol=rtol, atol=atol, equal_nan=True)
+        for j in np.flatnonzero(~close.all(axis=0)):
+            bad = ~close[:, j]
+            worst = np.nanmax(np.abs(act_num[bad, j] - exp_num[bad, j])) if bad.any() else np.nan
+            problems.append(f"{numeric[j]}: {int(bad.sum())} values differ (max abs diff {worst:.6g})")
+
+    if text:
+        mismatch = exp_text.to_numpy() != act_text.to_numpy()
+        for j in np.flatnonzero(mismatch.any(axis=0)):
+            i = np.flatnonzero(mismatch[:, j])[0]
+            problems.append(
+                f"{text[j]}: {int(mismatch[:, j].sum())} values differ "
+                f"(row {i}: {act_text.iat[i, j]!r} != {exp_text.iat[i, j]!r})"
+            )
+
+    return problems
+
+
+def check_against_golden(engine=None, golden_dir=GOLDEN_DIR, rtol=1e-6, atol=1e-6, ignore_order=False):
+    """
+    Re-runs every case (optionally with an alternate engine) and diffs it against the golden set.
+
+    Returns:
+        pd.DataFrame: One row per case with 'Case', 'Status' ('OK' / 'FAIL' / 'MISSING') and 'Detail'.
+    """
+    rows = []
+    for case in build_cases():
+        name = case[0]
+        path = _golden_path(name, golden_dir)
+        if not os.path.exists(path):
+            rows.append({'Case': name, 'Status': 'MISSING', 'Detail': f"no golden file {path}"})
+            continue
+
+        try:
+            actual = _round_trip(compute_case(case, engine))
+            problems = diff_frames(_read_golden(path), actual, rtol, atol, ignore_order)
+        except Exception as e:
+            problems = [f"error: {e}"]
+
+        rows.append({'Case': name, 'Status': 'FAIL' if problems else 'OK', 'Detail': '; '.join(problems)})
+
+    return pd.DataFrame(rows, columns=['Case', 'Status', 'Detail'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Golden-output regression harness for the alert checks")
+    parser.add_argument('--freeze', action='store_true', help="Overwrite the golden set with the current outputs")
+    parser.add_argument('--golden-dir', default=GOLDEN_DIR)
+    parser.add_argument('--rtol', type=float, default=1e-6)
+    parser.add_argument('--atol', type=float, default=1e-6)
+    parser.add_argument('--ignore-order', action='store_true', help="Compare rows regardless of order")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    if args.freeze:
+        count = freeze_golden(args.golden_dir)
+        print(f"Froze {count} golden outputs in {args.golden_dir}/ ({time.perf_counter() - start:.1f}s)")
+        return 0
+
+    report = check_against_golden(golden_dir=args.golden_dir, rtol=args.rtol, atol=args.atol,
+                                  ignore_order=args.ignore_order)
+    failed = report[report['Status'] != 'OK']
+    if not failed.empty:
+        print(failed.to_string(index=False))
+    print(f"{len(report) - len(failed)}/{len(report)} cases match golden ({time.perf_counter() - start:.1f}s)")
+    return 1 if len(failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --- Example Usage ---
+
+# Freeze the current outputs (after an intentional behaviour change):
+# python regression.py --freeze
+
+# Check the tree against the golden set:
+# python regression.py
+
+# Check an alternate implementation from Python:
+# report = check_against_golden(engine={'pacing.calculate_io_metrics': fast_calculate_io_metrics})
@@ -0,0 +1,175 @@
+import time
+
+_START = time.perf_counter()
+
+import os
+import sys
+import argparse
+from datetime import date, datetime, timedelta
+
+# Only stdlib is imported at module level. pandas, the check modules and the
+# Gemini / SMTP clients are pulled in on first use and then stay warm.
+
+DATA_FILES = {
+    'io': 'Data.csv',
+    'li': 'LI_Data.csv',
+}
+
+# Optional inputs: their checks only run when the file is present
+OPTIONAL_DATA_FILES = {
+    'impression': 'Impression_Data.csv',
+    'placement': 'Placement_Data.csv',
+}
+
+# path -> (mtime, DataFrame); reloaded only when the file on disk changes
+_frames = {}
+
+
+def load_frame(path):
+    """Returns a parsed CSV, re-reading it only if the file was modified since the last load."""
+    import pandas as pd
+
+    mtime = os.path.getmtime(path)
+    cached = _frames.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    df = pd.read_csv(path)
+    _frames[path] = (mtime, df)
+    return df
+
+
+def load_optional_frame(path):
+    """Like load_frame, but returns None when the file does not exist."""
+    if not os.path.exists(path):
+        _frames.pop(path, None)
+        return None
+    return load_frame(path)
+
+
+def run_for_date(target_date):
+    """
+    Runs the daily pipeline for one date using the warm reference frames.
+    Errors propagate so one-shot runs exit non-zero; the daemon catches them itself.
+    """
+    from main import run_daily
+
+    target_date_str = f"{target_date.month}/{target_date.day}/{target_date.year}"
+    print(f"[{datetime.now().isoformat(timespec='seconds')}] Running alerts for {target_date_str}")
+    return run_daily(
+        target_date_str,
+        IO_df=load_frame(DATA_FILES['io']),
+        LI_df=load_frame(DATA_FILES['li']),
+        impression_df=load_optional_frame(OPTIONAL_DATA_FILES['impression']),
+        placement_df=load_optional_frame(OPTIONAL_DATA_FILES['placement']),
+    )
+
+
+def run_backfill(start_date, end_date):
+    """
+    Runs the pipeline for every date in [start_date, end_date].
+    A failed day is reported and the remaining days still run.
+
+    Returns:
+        tuple: (results, failed)
+            results : date -> run_daily output for the days that succeeded
+            failed  : list of dates that raised
+    """
+    results = {}
+    failed = []
+    current = start_date
+    while current <= end_date:
+        try:
+            results[current] = run_for_date(current)
+        except Exception as e:
+            print(f"Error while running {current}: {e}")
+            failed.append(current)
+        current += timedelta(days=1)
+    return results, failed
+
+
+def seconds_until(run_at, now=None):
+    """Seconds from `now` until the next occurrence of the HH:MM time `run_at`."""
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in run_at.split(':'))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def run_daemon(run_at='07:00', backfill_from=None, backfill_to=None):
+    """
+    Stays resident and runs the pipeline once a day at `run_at` for the previous day.
+    If `backfill_from` is given, every date from it up to `backfill_to` (default yesterday) is run first.
+    """
+    from main import load_env
+    load_env()
+
+    if backfill_from is not None:
+        run_backfill(backfill_from, backfill_to or date.today() - timedelta(days=1))
+
+    while True:
+        wait = seconds_until(run_at)
+        print(f"Next run in {wait / 3600:.1f}h (at {run_at})")
+        time.sleep(wait)
+        target_date = date.today() - timedelta(days=1)
+        try:
+            run_for_date(target_date)
+        except Exception as e:
+            # A failed day must not take the daemon down
+            print(f"Error while running {target_date}: {e}")
+
+
+def parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DV360 alert scheduler")
+    parser.add_argument('--daemon', action='store_true', help="Stay resident and run daily")
+    parser.add_argument('--at', default='07:00', help="Daily run time for --daemon (HH:MM)")
+    parser.add_argument('--date', type=parse_date, help="One-shot run for this date (YYYY-MM-DD); defaults to yesterday")
+    parser.add_argument('--backfill-from', type=parse_date, help="Backfill from this date (YYYY-MM-DD)")
+    parser.add_argument('--backfill-to', type=parse_date, help="Backfill up to this date (YYYY-MM-DD); defaults to yesterday")
+    args = parser.parse_args(argv)
+
+    if args.backfill_to is not None and args.backfill_from is None:
+        parser.error("--backfill-to requires --backfill-from")
+
+    if args.daemon:
+        run_daemon(run_at=args.at, backfill_from=args.backfill_from, backfill_to=args.backfill_to)
+        return 0
+
+    print(f"Startup: {time.perf_counter() - _START:.3f}s")
+
+    from main import load_env
+    load_env()
+
+    # Non-zero exit on failure so cron can tell
+    if args.backfill_from is not None:
+        _, failed = run_backfill(args.backfill_from, args.backfill_to or date.today() - timedelta(days=1))
+        if failed:
+            print(f"{len(failed)} day(s) failed: {', '.join(str(d) for d in failed)}")
+            return 1
+    else:
+        print(run_for_date(args.date or date.today() - timedelta(days=1)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --- Example Usage ---
+
+# One-shot (cron) run for a specific date:
+# python scheduler.py --date 2025-04-02
+
+# Backfill a range, then exit:
+# python scheduler.py --backfill-from 2025-04-01 --backfill-to 2025-04-30
+
+# Resident daemon, runs every day at 07:00 for the previous day:
+# python scheduler.py --daemon --at 07:00
+
+# Resident daemon that first catches up on a fixed range:
+# python scheduler.py --daemon --backfill-from 2025-04-01 --backfill-to 2025-04-30
@@ -0,0 +1,153 @@
+import pandas as pd
+
+from email_body import ALERT_COLUMNS
+
+OK_VALUES = ('OK', 'Stable')
+
+
+# --- 1. Canonical Entity Index ---
+def build_entity_index(io_df=None, li_df=None):
+    """
+    Builds the canonical entity index every check is keyed on.
+    Index = entity name (IO or Line Item), with its parent IO_ID and Level.
+    IOs come from Data.csv (Insertion_Order_Name); LIs from LI_Data.csv
+    (Line_Item_Name -> Insertion_Order).
+    """
+    parts = []
+
+    if io_df is not None and not io_df.empty:
+        ios = io_df['Insertion_Order_Name'].drop_duplicates()
+        parts.append(pd.DataFrame({'Entity': ios.values, 'IO_ID': ios.values, 'Level': 'IO'}))
+
+    if li_df is not None and not li_df.empty:
+        lis = li_df[['Line_Item_Name', 'Insertion_Order']].drop_duplicates('Line_Item_Name')
+        parts.append(pd.DataFrame({'Entity': lis['Line_Item_Name'].values,
+                                   'IO_ID': lis['Insertion_Order'].values, 'Level': 'LI'}))
+
+    if not parts:
+        return pd.DataFrame(columns=['IO_ID', 'Level'], index=pd.Index([], name='Entity'))
+
+    index_df = pd.concat(parts, ignore_index=True).drop_duplicates('Entity')
+    return index_df.set_index('Entity')
+
+
+# --- 2. Normalising Check Outputs ---
+def _empty_alerts():
+    return pd.Series(dtype=object, index=pd.Index([], name='Entity'))
+
+
+def _collapse(alerts):
+    # Several rows for one entity (e.g. an IO with multiple dates) become one message
+    if alerts.index.has_duplicates:
+        alerts = alerts.groupby(level=0, sort=False).agg('; '.join)
+    return alerts
+
+
+def status_alerts(frame, key_col, status_col, label=None):
+    """
+    Reduces a check that already has a status column (kpi_alert 'Status',
+    pg_lag_alert 'Alert_Status', forecast 'Forecast_Alert', ...) to
+    Series[Entity -> alert text], keeping only non-OK entities.
+    """
+    if frame is None or isinstance(frame, str) or frame.empty:
+        return _empty_alerts()
+
+    status = frame[status_col].astype(str)
+    bad = ~status.isin(OK_VALUES)
+    text = status[bad] if label is None else pd.Series(label, index=status[bad].index)
+
+    alerts = pd.Series(text.values, index=pd.Index(frame.loc[bad, key_col].values, name='Entity'))
+    return _collapse(alerts)
+
+
+def threshold_alerts(frame, key_col, value_col, threshold, label):
+    """
+    Reduces a numeric check (e.g. pacing 'Deviation %', 'DoD Deviation %') to
+    Series[Entity -> alert text] where abs(value) > threshold, like main.filter_above_threshold.
+    """
+    if frame is None or isinstance(frame, str) or frame.empty:
+        return _empty_alerts()
+
+    values = pd.to_numeric(frame[value_col], errors='coerce')
+    bad = values.abs() > threshold
+    text = label + ": " + values[bad].map('{:+.1f}%'.format).astype(str)
+
+    alerts = pd.Series(text.values, index=pd.Index(frame.loc[bad, key_col].values, name='Entity'))
+    return _collapse(alerts)
+
+
+def message_alerts(frame, key_col, message_col):
+    """Uses a pre-formatted message column as-is (e.g. goal_alert 'Placement Alert')."""
+    if frame is None or isinstance(frame, str) or frame.empty:
+        return _empty_alerts()
+
+    alerts = pd.Series(frame[message_col].values, index=pd.Index(frame[key_col].values, name='Entity'))
+    return _collapse(alerts[~alerts.isin(OK_VALUES)])
+
+
+# --- 3. Assembler ---
+def assemble_scorecard(entity_index, checks):
+    """
+    Joins every check output onto the canonical entity index in one pass.
+
+    Args:
+        entity_index (pd.DataFrame): Output of build_entity_index (index = Entity, with IO_ID).
+        checks (dict): Alert column -> list of Series[Entity -> alert text]
+                       (from status_alerts / threshold_alerts / message_alerts).
+
+    Returns:
+        pd.DataFrame: One row per entity with IO_ID, Entity, Level and all ALERT_COLUMNS.
+                      Checks that did not run or did not flag an entity read 'OK'.
+    """
+    # Flatten every (alert column, source) into one uniquely named series so a single
+    # index-aligned concat (hash join on Entity) brings all checks together
+    series = []
+    owners = []
+    for alert_col, sources in checks.items():
+        for i, alerts in enumerate(sources):
+            series.append(alerts.rename(f"{alert_col}#{i}"))
+            owners.append(alert_col)
+
+    if series:
+        joined = pd.concat(series, axis=1, join='outer')
+        scorecard = entity_index.join(joined, how='outer')
+    else:
+        scorecard = entity_index.copy()
+
+    # Entities flagged by a check but unknown to the index are kept as their own IO
+    scorecard['IO_ID'] = scorecard['IO_ID'].fillna(pd.Series(scorecard.index, index=scorecard.index))
+    scorecard['Level'] = scorecard['Level'].fillna('Unmapped')
+
+    # Merge multiple sources feeding the same alert column, default to OK
+    for alert_col in ALERT_COLUMNS:
+        source_cols = [f"{alert_col}#{i}" for i in range(owners.count(alert_col))]
+        if not source_cols:
+            scorecard[alert_col] = 'OK'
+            continue
+
+        stacked = scorecard[source_cols].stack().dropna()
+        merged = stacked.groupby(level=0, sort=False).agg('; '.join)
+        scorecard[alert_col] = merged.reindex(scorecard.index).fillna('OK')
+        scorecard.drop(columns=source_cols, inplace=True)
+
+    scorecard.index.name = 'Entity'
+    return scorecard.reset_index()[['IO_ID', 'Entity', 'Level'] + ALERT_COLUMNS]
+
+
+def scorecard_alerts(scorecard):
+    """Rows with at least one non-OK alert - the slice used for LLM prompting."""
+    mask = scorecard[ALERT_COLUMNS].ne('OK').any(axis=1).to_numpy()
+    return scorecard[mask]
+
+# --- Example Usage ---
+
+# io_df = pd.read_csv('Data.csv')
+# li_df = pd.read_csv('LI_Data.csv')
+# entity_index = build_entity_index(io_df, li_df)
+
+# checks = {
+#     'KPI Alert': [status_alerts(analyze_cpm_performance(io_df.copy(), '4/2/2025'), 'Insertion_Order_Name', 'Status', 'CPM DoD spike & under goal')],
+#     'Deal Health': [status_alerts(calculate_li_pg_lag(li_df, '4/2/2025'), 'Line_Item_Name', 'Alert_Status')],
+# }
+# scorecard = assemble_scorecard(entity_index, checks)
+# html = generate_email_body(scorecard)
@@ -0,0 +1,227 @@
+import pandas as pd
+import numpy as np
+
+# Check name -> (rule, current production threshold)
+#   'abs'   : alert if abs(value) > threshold   (pacing, main.filter_above_threshold)
+#   'above' : alert if value > threshold        (kpi_alert DoD CPM change)
+#   'below' : alert if value < threshold        (pg_lag_alert / impression deviation)
+CHECKS = {
+    'pacing_ftd': ('abs', 20.0),
+    'pacing_dod': ('abs', 25.0),
+    'kpi_dod': ('above', 20.0),
+    'pg_lag': ('below', -20.0),
+    'impression_dev': ('below', -20.0),
+}
+
+# Checks whose history comes from Data.csv (the rest have their own builder)
+IO_CHECKS = ['pacing_ftd', 'pacing_dod', 'kpi_dod', 'pg_lag']
+
+
+# --- 1. Metric History (computed once, independent of thresholds) ---
+def build_io_metric_history(df):
+    """
+    Computes, for every IO and every date in Data.csv, the raw value each check
+    compares against its threshold. Formulas mirror pacing.calculate_io_metrics,
+    kpi_alert.analyze_cpm_performance and pg_lag_alert.calculate_io_pg_lag,
+    but for all dates at once instead of one target date per call.
+
+    Returns:
+        dict: check name -> DataFrame (index = Insertion_Order_Name, columns = Date).
+              NaN means the check cannot fire for that IO/day.
+    """
+    entity_col = 'Insertion_Order_Name'
+    df = df.copy()
+
+    for col in ['Date', 'IO_Start_Date', 'IO_End_Date']:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in ['Spends', 'Impressions', 'Planned_Budget', 'Insertion_Order_Goal_Value(KPI)']:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    df = df.sort_values(by=[entity_col, 'Date'])
+    grouped = df.groupby(entity_col)
+
+    # A. Pacing FTD Deviation %
+    actual_ftd = grouped['Spends'].cumsum()
+    total_days = (df['IO_End_Date'] - df['IO_Start_Date']).dt.days + 1
+    days_passed = ((df['Date'] - df['IO_Start_Date']).dt.days + 1).clip(lower=0)
+    days_passed = np.minimum(days_passed, total_days)
+    ideal_ftd = df['Planned_Budget'] / total_days * days_passed
+    df['pacing_ftd'] = np.where(ideal_ftd > 0, (actual_ftd - ideal_ftd) / ideal_ftd.where(ideal_ftd > 0, 1) * 100, 0.0)
+
+    # B. Pacing DoD Deviation % (strictly the previous calendar day, missing -> 0 spend)
+    prev = df[[entity_col, 'Date', 'Spends']].copy()
+    prev['Date'] = prev['Date'] + pd.Timedelta(days=1)
+    prev = prev.groupby([entity_col, 'Date'], as_index=False)['Spends'].sum()
+    yesterday = df[[entity_col, 'Date']].merge(prev, on=[entity_col, 'Date'], how='left')['Spends'].fillna(0).to_numpy()
+    today = df['Spends'].to_numpy()
+    df['pacing_dod'] = np.where(yesterday > 0, (today - yesterday) / np.where(yesterday > 0, yesterday, 1) * 100, 0.0)
+
+    # C. KPI DoD CPM change %, only eligible where FTD CPM is under goal
+    daily_cpm = np.where(df['Impressions'] > 0, df['Spends'] / df['Impressions'].where(df['Impressions'] > 0, 1) * 1000, 0.0)
+    df['Daily_CPM'] = daily_cpm
+    prev_cpm = df.groupby(entity_col)['Daily_CPM'].shift(1)
+    dod_cpm = np.where(prev_cpm > 0, (df['Daily_CPM'] - prev_cpm) / prev_cpm.where(prev_cpm > 0, 1) * 100, 0.0)
+
+    in_flight = df['Date'] >= df['IO_Start_Date']
+    flight_df = df[in_flight]
+    ftd_spend = flight_df.groupby(entity_col)['Spends'].cumsum().reindex(df.index)
+    ftd_imps = flight_df.groupby(entity_col)['Impressions'].cumsum().reindex(df.index)
+    ftd_cpm = np.where(ftd_imps > 0, ftd_spend / ftd_imps.where(ftd_imps > 0, 1) * 1000, 0.0)
+    under_goal = ftd_cpm < df['Insertion_Order_Goal_Value(KPI)']
+    df['kpi_dod'] = np.where(under_goal, dod_cpm, np.nan)
+
+    # D. PG Impression Lag %
+    cpm_goal = df['Insertion_Order_Goal_Value(KPI)'].where(df['Insertion_Order_Goal_Value(KPI)'] != 0, 1)
+    impression_goal = (df['Planned_Budget'] / cpm_goal * 1000).round(0)
+    ideal_imps = impression_goal / total_days * days_passed
+    actual_imps = grouped['Impressions'].cumsum()
+    df['pg_lag'] = np.where(ideal_imps > 0, (actual_imps - ideal_imps) / ideal_imps.where(ideal_imps > 0, 1) * 100, 0.0)
+
+    history = {}
+    for check in IO_CHECKS:
+        history[check] = df.pivot_table(index=entity_col, columns='Date', values=check, aggfunc='last', dropna=False)
+    return history
+
+
+def build_impression_metric_history(df):
+    """
+    Computes the daily impression deviation % of impression.check_daily_impression_deviation
+    for every IO and every date in Impression_Data.csv at once.
+
+    Returns:
+        dict: {'impression_dev': DataFrame (index = Insertion_Order, columns = Date)}.
+              Merge it into the IO history to simulate it alongside the other checks;
+              simulate_threshold_pair only lines up checks built from the same file.
+    """
+    entity_col = 'Insertion_Order'
+    df = df.copy()
+
+    for col in ['Date', 'IO_Start_Date', 'IO_End_Date']:
+        df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in ['Impressions', 'IO_Goal_Value', 'IO_Impr_Budget']:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    # Same formula as impression.py: goal = impression budget / (IO goal value * flight days)
+    total_days = (df['IO_End_Date'] - df['IO_Start_Date']).dt.days + 1
+    daily_goal = df['IO_Impr_Budget'] / (df['IO_Goal_Value'] * total_days)
+    df['impression_dev'] = (df['Impressions'] - daily_goal) / daily_goal * 100
+
+    history = df.pivot_table(index=entity_col, columns='Date', values='impression_dev', aggfunc='last', dropna=False)
+    return {'impression_dev': history}
+
+
+# --- 2. Broadcast Evaluation ---
+def _fires(values, rule, thresholds):
+    """Boolean alert cube [threshold, entity, day] for every threshold at once."""
+    v = values[None, :, :]
+    t = np.asarray(thresholds, dtype=float)[:, None, None]
+    with np.errstate(invalid='ignore'):
+        if rule == 'abs':
+            fired = np.abs(v) > t
+        elif rule == 'above':
+            fired = v > t
+        elif rule == 'below':
+            fired = v < t
+        else:
+            raise ValueError(f"Unknown rule: {rule}")
+    return fired & ~np.isnan(v)
+
+
+def _churn(fired):
+    # Share of entity-days whose alert state flipped vs the previous day
+    if fired.shape[2] < 2:
+        return np.zeros(fired.shape[0])
+    return (fired[:, :, 1:] != fired[:, :, :-1]).mean(axis=(1, 2))
+
+
+def simulate_thresholds(history, grids):
+    """
+    Evaluates a grid of thresholds per check over the full history in one broadcast step.
+
+    Args:
+        history (dict): Output of build_io_metric_history.
+        grids (dict): check name -> 1D array of thresholds to try.
+
+    Returns:
+        dict: check name -> DataFrame indexed by threshold with
+              'Mean Alerts/Day', 'Max Alerts/Day', 'Churn %', plus one column per date (alert count).
+    """
+    report = {}
+    for check, thresholds in grids.items():
+        rule = CHECKS[check][0]
+        matrix = history[check]
+        fired = _fires(matrix.to_numpy(dtype=float), rule, thresholds)
+
+        per_day = fired.sum(axis=1)
+        summary = pd.DataFrame(per_day, index=pd.Index(thresholds, name='Threshold'), columns=matrix.columns)
+        summary.insert(0, 'Churn %', (_churn(fired) * 100).round(2))
+        summary.insert(0, 'Max Alerts/Day', per_day.max(axis=1))
+        summary.insert(0, 'Mean Alerts/Day', per_day.mean(axis=1).round(2))
+        report[check] = summary
+    return report
+
+
+def simulate_threshold_pair(history, check_a, grid_a, check_b, grid_b):
+    """
+    Evaluates the full grid_a x grid_b cross of two checks (e.g. 50x50) over the history.
+    Co-firing counts come from one batched matrix product per day instead of looping over settings.
+
+    Returns:
+        dict with DataFrames indexed by grid_a, columns grid_b:
+            'mean_alerts'  : mean entities/day flagged by either check
+            'overlap'      : mean Jaccard overlap (both / either) of the two checks' alerts
+            'churn'        : share of entity-days whose combined alert state flipped, in %
+        and 'alerts_per_day': ndarray [len(grid_a), len(grid_b), n_days] of combined alert counts.
+    """
+    values_a = history[check_a]
+    values_b = history[check_b].reindex(index=values_a.index, columns=values_a.columns)
+
+    fa = _fires(values_a.to_numpy(dtype=float), CHECKS[check_a][0], grid_a).astype(np.float32)
+    fb = _fires(values_b.to_numpy(dtype=float), CHECKS[check_b][0], grid_b).astype(np.float32)
+
+    # both[d, i, j] = sum_e fa[i, e, d] * fb[j, e, d]
+    both = np.matmul(fa.transpose(2, 0, 1), fb.transpose(2, 1, 0)).transpose(1, 2, 0)
+    count_a = fa.sum(axis=1)
+    count_b = fb.sum(axis=1)
+    either = count_a[:, None, :] + count_b[None, :, :] - both
+
+    overlap = np.divide(both, either, out=np.zeros_like(both), where=either > 0).mean(axis=2)
+
+    # Combined churn: an entity flips when (a|b) differs between day t-1 and t.
+    # Entities alert-free on both days under both checks factor as
+    # (no a on t-1 and t) x (no b on t-1 and t), so they are also one matmul per day.
+    if fa.shape[2] > 1:
+        quiet_a = (1 - fa[:, :, 1:]) * (1 - fa[:, :, :-1])
+        quiet_b = (1 - fb[:, :, 1:]) * (1 - fb[:, :, :-1])
+        quiet = np.matmul(quiet_a.transpose(2, 0, 1), quiet_b.transpose(2, 1, 0)).transpose(1, 2, 0)
+        alert_either_day = fa.shape[1] - quiet
+        flips = 2 * alert_either_day - either[:, :, 1:] - either[:, :, :-1]
+        churn = flips.sum(axis=2) / (fa.shape[1] * (fa.shape[2] - 1)) * 100
+    else:
+        churn = np.zeros((len(grid_a), len(grid_b)))
+
+    idx = pd.Index(grid_a, name=check_a)
+    cols = pd.Index(grid_b, name=check_b)
+    return {
+        'mean_alerts': pd.DataFrame(either.mean(axis=2), index=idx, columns=cols).round(2),
+        'overlap': pd.DataFrame(overlap, index=idx, columns=cols).round(3),
+        'churn': pd.DataFrame(churn, index=idx, columns=cols).round(2),
+        'alerts_per_day': either,
+    }
+
+# --- Example Usage ---
+
+# io_df = pd.read_csv('Data.csv')
+# history = build_io_metric_history(io_df)
+
+# # One check at a time: 50 DoD thresholds between 5% and 100%
+# report = simulate_thresholds(history, {'pacing_dod': np.linspace(5, 100, 50)})
+# print(report['pacing_dod'][['Mean Alerts/Day', 'Max Alerts/Day', 'Churn %']].to_string())
+
+# # Impression deviation cutoff (Impression_Data.csv), merged into the same history
+# history.update(build_impression_metric_history(pd.read_csv('Impression_Data.csv')))
+# report = simulate_thresholds(history, {'impression_dev': np.linspace(-50, 0, 50)})
+
+# # 50 x 50 cross of the KPI DoD cutoff and the PG lag cutoff
+# pair = simulate_threshold_pair(history, 'kpi_dod', np.linspace(5, 100, 50), 'pg_lag', np.linspace(-50, 0, 50))
+# print(pair['mean_alerts'].to_string())